@@ -9,43 +9,101 @@
 # SECTION 1: Load and Prepare the Data
 #
 # Purpose:
-# - Import dataset from CSV
+# - Import dataset from CSV (cached as Arrow/Feather after the first run)
 # - Explore structure and summary
 # - Clean missing values (drop NAs)
 # - Rename columns for clarity
-# - Convert text variables into categorical
+# - Read text variables directly as categorical
 # - Filter out empty codes and world aggregate (OWID_WRL)
+# - Compute absolute emissions (co2_abs) once for later sections
+# - Slice 2022 for maps, then downcast co2_pc to float32
+# - Slice the most recent year once
 #
 # Note:
-# - This section also includes guidance on how to install
-#   required libraries in case they are not available.
+# - Required libraries are listed in requirements.txt. Install them
+#   once before running the script:
+#     python -m pip install -r requirements.txt
 # ============================================================
 
-# --- Check and install required libraries if needed ---
-import importlib
-import sys
-import subprocess
-
-def install_if_missing(package):
-    try:
-        importlib.import_module(package)
-    except ImportError:
-        print(f"⚠️ {package} not found. Installing...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-
-# Core libraries for Section 1
-for pkg in ["pandas", "seaborn", "matplotlib"]:
-    install_if_missing(pkg)
-
 # --- Import libraries ---
+import os
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# pyarrow enables the cached loader below; without it (e.g. on Windows ARM64,
+# where requirements.txt skips it) the CSV is read with pandas on every run
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    import pyarrow.feather as ft
+except ImportError:
+    pa = None
+
 # --- Load dataset ---
+# With pyarrow, the CSV is parsed only once; later runs memory-map a typed
+# Arrow (Feather) copy, which needs almost no deserialization.
 # Note: Adjust separator and decimal format according to file
-dataset = pd.read_csv("Data/csv/consumption-co2-per-capita-vs-gdppc.csv",
-                      sep=";", decimal=",")
+CSV_PATH = "Data/csv/consumption-co2-per-capita-vs-gdppc.csv"
+# Bump the version in the file name whenever the cache layout changes,
+# so caches written by older versions of this script are never reused
+CACHE_PATH = "Data/cache/co2.v2.arrow"
+COLUMNS = ["country", "code", "year", "co2_pc", "gdp_pc", "pop", "region"]
+TEXT_COLUMNS = ["country", "code", "region"]
+
+def build_cache(csv_path=CSV_PATH, cache_path=CACHE_PATH):
+    # Text columns are parsed as Arrow dictionaries, which arrive in
+    # pandas as categoricals (no object -> category conversion needed)
+    # Header row is skipped and replaced by the short column names
+    table = pcsv.read_csv(
+        csv_path,
+        read_options=pcsv.ReadOptions(column_names=COLUMNS, skip_rows=1),
+        parse_options=pcsv.ParseOptions(delimiter=";"),
+        convert_options=pcsv.ConvertOptions(
+            decimal_point=",",
+            strings_can_be_null=True,   # empty fields -> NA, as in pandas
+            column_types={c: pa.dictionary(pa.int32(), pa.string())
+                          for c in TEXT_COLUMNS}
+        )
+    )
+    # Arrow keeps dictionary entries in order of appearance; sort them
+    # once here so categories (and legend order) match astype("category")
+    raw = table.to_pandas()
+    for col in TEXT_COLUMNS:
+        raw[col] = raw[col].cat.reorder_categories(sorted(raw[col].cat.categories))
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # Write next to the cache and rename into place, so an interrupted run
+    # (e.g. Ctrl-C) never leaves a truncated cache file behind.
+    # Uncompressed so the file can be memory-mapped as-is
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        ft.write_feather(pa.Table.from_pandas(raw, preserve_index=False),
+                         tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):   # only left over if the write failed
+            os.remove(tmp_path)
+
+def load_dataset(csv_path=CSV_PATH, cache_path=CACHE_PATH):
+    if pa is None:
+        df = pd.read_csv(csv_path, sep=";", decimal=",")
+        df.columns = COLUMNS   # rename columns for clarity
+        df[TEXT_COLUMNS] = df[TEXT_COLUMNS].astype("category")
+        return df
+
+    # Rebuild the cache if it is missing or older than the CSV
+    if (not os.path.exists(cache_path)
+            or os.path.getmtime(cache_path) < os.path.getmtime(csv_path)):
+        build_cache(csv_path, cache_path)
+    try:
+        table = ft.read_table(cache_path, columns=COLUMNS, memory_map=True)
+    except pa.ArrowInvalid:
+        # Unreadable cache (e.g. a truncated file): rebuild it once
+        build_cache(csv_path, cache_path)
+        table = ft.read_table(cache_path, columns=COLUMNS, memory_map=True)
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+dataset = load_dataset()
 
 # --- Quick overview ---
 print("Dataset dimensions:", dataset.shape)
@@ -55,18 +113,41 @@ display(dataset.head())
 print("\nStatistical summary:")
 display(dataset.describe(include="all"))
 
-# --- Rename columns ---
-dataset.columns = ["country", "code", "year", "co2_pc", "gdp_pc", "pop", "region"]
-
 # --- Remove missing values ---
 dataset = dataset.dropna()
 
-# --- Convert object (string) columns into categorical ---
-for col in dataset.select_dtypes(include="object").columns:
-    dataset[col] = dataset[col].astype("category")
-
 # --- Filter out empty codes and OWID_WRL (world aggregate) ---
-dataset = dataset[(dataset["code"] != "") & (dataset["code"] != "OWID_WRL")]
+dataset = dataset[~dataset["code"].isin(["", "OWID_WRL"])]
+
+# --- Absolute emissions (population × per capita), reused in later sections ---
+# Computed in float64 before the downcast below: values reach ~1e10, beyond
+# float32's ~7 significant digits, and Section 3 prints them as integers.
+dataset["co2_abs"] = dataset["co2_pc"] * dataset["pop"]
+
+# --- Section 7 maps: only the columns Plotly reads ---
+# Sliced before the downcast below, since the map tooltips show raw values
+map_2022 = dataset.loc[
+    dataset["year"] == 2022,
+    ["code", "country", "co2_pc", "gdp_pc", "pop", "region"]
+]
+
+# --- Downcast co2_pc to float32 ---
+# Halves that column's memory in the shared frame and the bytes read by the
+# Section 5 scatter and the optional Numba kernel. Per-capita values carry
+# only a few decimals, well within float32's ~7 significant digits.
+# pop and gdp_pc stay float64: float32 would alter the exact populations
+# and GDP figures that are displayed.
+dataset["co2_pc"] = dataset["co2_pc"].astype("float32")
+
+# --- Sort by year once (stable, so countries keep their order within a year) ---
+# Later groupbys by year can then pass sort=False and skip their own sort.
+dataset = dataset.sort_values("year", kind="stable", ignore_index=True)
+
+# --- Year slices shared by the plotting sections ---
+latest_year = int(dataset["year"].max())
+# The boolean mask already builds a new frame; no explicit .copy() is
+# added because the plotting sections only read these slices
+latest_df = dataset.loc[dataset["year"] == latest_year]
 
 # --- Final check ---
 print("\nDimensions after cleaning:", dataset.shape)
@@ -80,14 +161,47 @@ display(dataset.head())
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+import numpy as np
 
 # --- Group by year and calculate population-weighted CO2 per capita ---
-global_ts = (
-    dataset
-    .groupby("year")
-    .apply(lambda df: (df["co2_pc"] * df["pop"]).sum() / df["pop"].sum())
-    .reset_index(name="co2")   # reset index to keep 'year' as a column
-)
+# Optional: set CO2_USE_NUMBA=1 to compute it with a compiled Numba kernel
+# instead (not needed at this size; useful when scaling to many more
+# countries, years or indicators; requires numba)
+USE_NUMBA = os.environ.get("CO2_USE_NUMBA") == "1"
+
+if USE_NUMBA:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def wmean_by_year(bounds, co2_pc, pop, out):
+        # Rows of year i are co2_pc[bounds[i]:bounds[i + 1]] (data sorted by year)
+        for i in prange(out.shape[0]):
+            num = 0.0
+            den = 0.0
+            for j in range(bounds[i], bounds[i + 1]):
+                num += co2_pc[j] * pop[j]
+                den += pop[j]
+            out[i] = num / den
+
+    sorted_years = dataset["year"].values
+    unique_years = np.unique(sorted_years)
+    bounds = np.searchsorted(sorted_years, np.append(unique_years, unique_years[-1] + 1))
+    weighted_co2 = np.empty(unique_years.shape[0])
+    wmean_by_year(bounds, dataset["co2_pc"].values, dataset["pop"].values, weighted_co2)
+    global_ts = pd.DataFrame({"year": unique_years, "co2": weighted_co2})
+else:
+    # (sum of absolute emissions / sum of population, no per-group lambda)
+    yearly = (
+        dataset
+        .groupby("year", sort=False, observed=True)[["co2_abs", "pop"]]   # already sorted by year
+        .sum()
+        .astype("float64")
+    )
+    global_ts = (
+        (yearly["co2_abs"] / yearly["pop"])
+        .rename("co2")
+        .reset_index()   # reset index to keep 'year' as a column
+    )
 
 # --- Ensure year is numeric ---
 global_ts["year"] = pd.to_numeric(global_ts["year"], errors="coerce")
@@ -97,16 +211,17 @@ last_year = global_ts["year"].max()
 min_val = global_ts["co2"].min()
 max_val = global_ts["co2"].max()
 
-global_ts["marker"] = global_ts.apply(
-    lambda row: "A" if row["year"] == last_year else
-                "B" if row["co2"] == min_val else
-                "C" if row["co2"] == max_val else "D",
-    axis=1
+# Conditions are checked in order (same precedence as the A/B/C/D labels)
+year_arr = global_ts["year"].values
+co2_arr = global_ts["co2"].values
+global_ts["marker"] = np.select(
+    [year_arr == last_year, co2_arr == min_val, co2_arr == max_val],
+    ["A", "B", "C"],
+    default="D"
 )
 
-global_ts["value"] = global_ts.apply(
-    lambda row: row["co2"] if row["marker"] in ["A", "B", "C"] else None,
-    axis=1
+global_ts["value"] = np.where(
+    global_ts["marker"].isin(["A", "B", "C"]), global_ts["co2"], np.nan
 )
 
 # --- Custom colors for markers ---
@@ -118,14 +233,22 @@ marker_colors = {
 }
 
 # --- Build subtitle text (dynamic) ---
-subtitle_labels = []
-for _, row in global_ts[global_ts["marker"].isin(["A","B","C"])].iterrows():
-    if row["marker"] == "A":
-        subtitle_labels.append(f"Last: {row['value']:.1f}")
-    elif row["marker"] == "B":
-        subtitle_labels.append(f"Min: {row['value']:.1f} ({int(row['year'])})")
-    elif row["marker"] == "C":
-        subtitle_labels.append(f"Max: {row['value']:.1f} ({int(row['year'])})")
+# Marker -> {"year", "value"} for the highlighted rows (kept in year order)
+key_points = (
+    global_ts[global_ts["marker"] != "D"]
+    .drop_duplicates("marker")
+    .set_index("marker")[["year", "value"]]
+    .to_dict("index")
+)
+label_formats = {
+    "A": "Last: {value:.1f}",
+    "B": "Min: {value:.1f} ({year})",
+    "C": "Max: {value:.1f} ({year})"
+}
+subtitle_labels = [
+    label_formats[m].format(value=point["value"], year=int(point["year"]))
+    for m, point in key_points.items()
+]
 
 subtitle_text = "Key points • " + " • ".join(subtitle_labels)
 
@@ -145,13 +268,9 @@ for _, row in global_ts.dropna(subset=["value"]).iterrows():
         ha="center", va="bottom", fontsize=10, fontweight="bold"
     )
 
-# Titles (mimicking ggplot2 labs)
-plt.title("Per Capita CO₂ Footprint", fontsize=16, fontweight="bold", loc="center", pad=20)
-plt.text(
-    0.5, 1.02, subtitle_text,
-    ha="center", va="bottom", transform=plt.gca().transAxes,
-    fontsize=12
-)
+# Titles (mimicking ggplot2 labs): figure title on top, subtitle as the axes title
+plt.suptitle("Per Capita CO₂ Footprint", fontsize=16, fontweight="bold")
+plt.title(subtitle_text, fontsize=12, loc="center")
 
 # Axis adjustments
 plt.ylim(0, global_ts["co2"].max() * 1.15)
@@ -166,61 +285,47 @@ plt.show()
 #
 # Purpose:
 # - Focus on the most recent year available
-# - Calculate total CO2 emissions (population × per capita)
+# - Use total CO2 emissions (co2_abs = population × per capita, Section 1)
 # - Rank countries and select the Top 10 emitters
 # - Visualize with horizontal bars and aligned labels
 # ============================================================
 
-# --- Filter most recent year ---
-latest_year = dataset["year"].max()
-
-top10 = (
-    dataset[dataset["year"] == latest_year]
-    .groupby("country", as_index=False)
-    .agg({"co2_pc": "mean", "pop": "mean"})   # keep columns
-)
-
-# --- Calculate absolute emissions ---
-top10["co2"] = top10["co2_pc"] * top10["pop"]
-
-# --- Select Top 10 emitters ---
-top10 = top10.nlargest(10, "co2").copy()
+# --- Select Top 10 emitters (latest_df and co2_abs come from Section 1) ---
+top10 = latest_df.nlargest(10, "co2_abs")
 
 # --- Sort for horizontal plot ---
-top10 = top10.sort_values("co2", ascending=True)
+top10 = top10.sort_values("co2_abs", ascending=True)
 
 # --- Plot ---
 plt.figure(figsize=(10,6))
-bars = plt.barh(top10["country"], top10["co2"], color="#b3b3b3")  # 70% grey
+bars = plt.barh(top10["country"], top10["co2_abs"], color="#b3b3b3")  # 70% grey
 
 # Highlight the maximum emitter (bold, inside the bar)
-max_row = top10.loc[top10["co2"].idxmax()]
+max_row = top10.loc[top10["co2_abs"].idxmax()]
 plt.text(
-    max_row["co2"]*0.99, max_row["country"],
-    f"{max_row['co2']:.0f}", color="white",
+    max_row["co2_abs"]*0.99, max_row["country"],
+    f"{max_row['co2_abs']:.0f}", color="white",
     ha="right", va="center", fontsize=11, fontweight="bold"
 )
 
 # Labels for other countries (aligned with the maximum bar)
-for _, row in top10.iterrows():
-    if row["country"] != max_row["country"]:
+# Iterate plain arrays instead of iterrows() (no Series per row)
+for country, co2 in zip(top10["country"].values, top10["co2_abs"].values):
+    if country != max_row["country"]:
         plt.text(
-            max_row["co2"]*0.99, row["country"],
-            f"{row['co2']:.0f}", color="black",
+            max_row["co2_abs"]*0.99, country,
+            f"{co2:.0f}", color="black",
             ha="right", va="center", fontsize=10
         )
 
 # Titles and subtitles
-plt.title("Where most CO₂ comes from", fontsize=16, fontweight="bold", pad=20)
-plt.text(
-    0.5, 1.02, "Top 10 emitters (absolute values – selected period)",
-    ha="center", va="bottom", transform=plt.gca().transAxes, fontsize=12
-)
+plt.suptitle("Where most CO₂ comes from", fontsize=16, fontweight="bold")
+plt.title("Top 10 emitters (absolute values – selected period)", fontsize=12)
 
 # Axis cleanup
 plt.xlabel(None)
 plt.ylabel(None)
-plt.xlim(0, top10["co2"].max() * 1.15)  # <-- fixed
+plt.xlim(0, top10["co2_abs"].max() * 1.15)  # <-- fixed
 
 sns.despine(left=True, bottom=True)
 plt.show()
@@ -234,63 +339,51 @@ plt.show()
 # - Visualize with horizontal bars and labels in "X.X bn"
 # ============================================================
 
-# --- Filter most recent year ---
-latest_year = dataset["year"].max()
+import matplotlib.ticker as mticker
 
+# --- Select Top 10 emitters and convert to billions ---
+# (latest_df and co2_abs come from Section 1)
 top10_bn = (
-    dataset[dataset["year"] == latest_year]
-    .groupby("country", as_index=False)
-    .agg({"co2_pc": "mean", "pop": "mean"})
+    latest_df
+    .nlargest(10, "co2_abs")
+    .assign(co2_B=lambda df: df["co2_abs"] / 1e9)   # billions
 )
 
-# --- Calculate absolute emissions and convert to billions ---
-top10_bn["co2"] = top10_bn["co2_pc"] * top10_bn["pop"]
-top10_bn["co2_B"] = top10_bn["co2"] / 1e9   # billions
-
-# --- Select Top 10 emitters ---
-top10_bn = top10_bn.nlargest(10, "co2").copy()
-
 # --- Sort for horizontal plot ---
-top10_bn = top10_bn.sort_values("co2", ascending=True)
+top10_bn = top10_bn.sort_values("co2_abs", ascending=True)
 
 # --- Plot ---
 plt.figure(figsize=(10,6))
-bars = plt.barh(top10_bn["country"], top10_bn["co2"], color="#b3b3b3")
+bars = plt.barh(top10_bn["country"], top10_bn["co2_abs"], color="#b3b3b3")
 
 # Highlight the maximum emitter with bold label inside the bar
-max_row = top10_bn.loc[top10_bn["co2"].idxmax()]
+max_row = top10_bn.loc[top10_bn["co2_abs"].idxmax()]
 plt.text(
-    max_row["co2"]*0.99, max_row["country"],
+    max_row["co2_abs"]*0.99, max_row["country"],
     f"{max_row['co2_B']:.1f} bn", color="white",
     ha="right", va="center", fontsize=11, fontweight="bold"
 )
 
 # Labels for other emitters aligned with the maximum bar
-for _, row in top10_bn.iterrows():
-    if row["country"] != max_row["country"]:
+for country, co2_b in zip(top10_bn["country"].values, top10_bn["co2_B"].values):
+    if country != max_row["country"]:
         plt.text(
-            max_row["co2"]*0.99, row["country"],
-            f"{row['co2_B']:.1f} bn", color="black",
+            max_row["co2_abs"]*0.99, country,
+            f"{co2_b:.1f} bn", color="black",
             ha="right", va="center", fontsize=10
         )
 
 # Titles and subtitles
-plt.title("Where most CO₂ comes from", fontsize=16, fontweight="bold", pad=20)
-plt.text(
-    0.5, 1.02, "Top 10 emitters (absolute values in billions – last period)",
-    ha="center", va="bottom", transform=plt.gca().transAxes, fontsize=12
-)
+plt.suptitle("Where most CO₂ comes from", fontsize=16, fontweight="bold")
+plt.title("Top 10 emitters (absolute values in billions – last period)", fontsize=12)
 
 # Axis cleanup
 plt.xlabel(None)
 plt.ylabel(None)
-plt.xlim(0, top10_bn["co2"].max() * 1.15)
+plt.xlim(0, top10_bn["co2_abs"].max() * 1.15)
 
-# Format x-axis ticks to billions
-plt.xticks(
-    plt.xticks()[0],
-    [f"{x/1e9:.1f} bn" for x in plt.xticks()[0]]
-)
+# Format x-axis ticks to billions (tick positions stay automatic)
+plt.gca().xaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f"{x/1e9:.1f} bn"))
 
 sns.despine(left=True, bottom=True)
 plt.show()
@@ -307,9 +400,8 @@ plt.show()
 import seaborn as sns
 import matplotlib.ticker as mticker
 
-# --- Filter most recent year ---
-latest_year = dataset["year"].max()
-scatter_data = dataset[dataset["year"] == latest_year].copy()
+# --- Most recent year (computed once in Section 1) ---
+scatter_data = latest_df
 
 # --- Custom color palette for regions ---
 region_colors = {
@@ -333,15 +425,11 @@ sns.scatterplot(
 
 # Logarithmic scale for GDP per capita
 plt.xscale("log")
-plt.gca().xaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f"{int(x):,}"))
+plt.gca().xaxis.set_major_formatter(mticker.StrMethodFormatter("{x:,.0f}"))
 
 # Titles and labels
-plt.title("Wealth, emissions and population combined", fontsize=16, fontweight="bold", pad=20)
-plt.text(
-    0.5, 1.02,
-    f"Worldwide – Entities: {scatter_data['country'].nunique()}",
-    ha="center", va="bottom", transform=plt.gca().transAxes, fontsize=12
-)
+plt.suptitle("Wealth, emissions and population combined", fontsize=16, fontweight="bold")
+plt.title(f"Worldwide – Entities: {scatter_data['country'].nunique()}", fontsize=12)
 
 plt.xlabel("GDP per capita", fontsize=12)
 plt.ylabel("CO₂ emissions per capita", fontsize=12)
@@ -372,17 +460,6 @@ plt.show()
 # SECTION 6: Regional Time Series - Stacked Area Chart
 # ============================================================
 
-# --- Create absolute emissions first ---
-dataset["co2_abs"] = dataset["co2_pc"] * dataset["pop"]
-
-# --- Aggregate emissions by year and region ---
-regional_ts = (
-    dataset
-    .groupby(["year", "region"], as_index=False)
-    .agg({"co2_abs": "sum"})
-    .rename(columns={"co2_abs": "co2"})
-)
-
 # --- Custom color palette (consistent with Section 5) ---
 region_colors = {
     "Africa": "#70B0E0",
@@ -393,31 +470,33 @@ region_colors = {
     "South America": "#AF916D"
 }
 
-# --- Pivot for stacked area ---
-pivot_data = regional_ts.pivot(index="year", columns="region", values="co2").fillna(0)
+# --- Aggregate emissions by year and region, pivoted for stacked area ---
+# (one call: group-sum, pivot and zero-fill; observed=True skips unused regions)
+pivot_data = pd.pivot_table(
+    dataset, index="year", columns="region", values="co2_abs",
+    aggfunc="sum", fill_value=0, observed=True
+)
 
 # --- Plot ---
 fig, ax = plt.subplots(figsize=(12,7))
 
-# Stacked area
-pivot_data.plot.area(
-    ax=ax, alpha=0.65, linewidth=0,
-    color=[region_colors.get(r, "#cccccc") for r in pivot_data.columns]
-)
+years = pivot_data.index.values
+values = pivot_data.values
+colors = [region_colors.get(r, "#cccccc") for r in pivot_data.columns]
 
-# Add lines on top of areas for readability
-pivot_data.plot(
-    ax=ax, linewidth=1,
-    color=[region_colors.get(r, "#cccccc") for r in pivot_data.columns],
-    legend=False
+# Stacked area (single stackplot over the NumPy array)
+ax.stackplot(
+    years, values.T, labels=pivot_data.columns,
+    colors=colors, alpha=0.65, linewidth=0
 )
 
+# Add lines on top of each band for readability
+for band_top, color in zip(values.cumsum(axis=1).T, colors):
+    ax.plot(years, band_top, color=color, linewidth=1)
+
 # Titles and labels
-ax.set_title("How regions drive global CO₂ growth", fontsize=16, fontweight="bold", pad=20)
-ax.text(
-    0.5, 1.02, "Stacked area by region",
-    ha="center", va="bottom", transform=ax.transAxes, fontsize=12
-)
+fig.suptitle("How regions drive global CO₂ growth", fontsize=16, fontweight="bold")
+ax.set_title("Stacked area by region", fontsize=12)
 
 ax.set_xlabel(None)
 ax.set_ylabel("CO₂ emissions (absolute)", fontsize=12)
@@ -439,13 +518,14 @@ plt.show()
 
 import plotly.express as px
 
-# --- Prepare dataset for mapping (2022) ---
-map_data = dataset[dataset["year"] == 2022].copy()
+# --- Prepare dataset for mapping (2022, sliced in Section 1) ---
+map_data = map_2022
 
 # --- Global map ---
 fig_global = px.choropleth(
     map_data,
     locations="code",              # ISO3 country codes
+    locationmode="ISO-3",
     color="co2_pc",                # CO₂ per capita
     hover_name="country",
     hover_data={"gdp_pc": True, "pop": True},
@@ -460,11 +540,12 @@ fig_global.update_layout(
 fig_global.show()
 
 # --- Regional map (example: North America) ---
-map_region = map_data[map_data["region"] == "North America"].copy()
+map_region = map_data[map_data["region"] == "North America"]
 
 fig_region = px.choropleth(
     map_region,
     locations="code",
+    locationmode="ISO-3",
     color="co2_pc",
     hover_name="country",
     hover_data={"gdp_pc": True, "pop": True},